@@ -17,6 +17,7 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
+import collections
 import copy
 import math
 import multiprocessing
@@ -26,7 +27,9 @@ import traceback
 import sys
 import os
 import datetime
+import json
 import random
+import queue
 
 # PyRat imports
 from pyrat.src.Maze import Maze
@@ -225,6 +228,8 @@ class Game ():
         self.__players_rng = None
         self.__players_asked_location = []
         self.__players = []
+        self.__players_with_names = None
+        self.__player_names = None
         self.__initial_game_state = None
         self.__player_traces = None
         self.__actions_history = None
@@ -367,7 +372,7 @@ class Game ():
 
         # Other attributes
         self.__players.append(player)
-        self.__player_traces[player.name] = []
+        self.__player_traces[player.name] = collections.deque(maxlen=self.__trace_length)
         self.__actions_history[player.name] = []
         
     #############################################################################################################################################
@@ -458,6 +463,10 @@ class Game ():
             # Mark the game as not reset
             self.__reset_called = False
 
+            # Players are fixed for the whole game, so we pair them with their names once
+            self.__players_with_names = tuple((player, player.name) for player in self.__players)
+            self.__player_names = frozenset(player_name for _, player_name in self.__players_with_names)
+
             # Initialize stats
             stats = {"players": {}, "turns": -1}
             for player in self.__players:
@@ -475,16 +484,21 @@ class Game ():
                                                                 "wall" : 0}}
             
             # In multiprocessing mode, prepare processes
-            maze_per_player = {player.name: copy.deepcopy(self.__maze) for player in self.__players}
             if self.__game_mode in [GameMode.STANDARD, GameMode.SYNCHRONOUS]:
 
+                # Processes inherit the maze when forked, or receive a pickled copy otherwise, so each player already has its own maze
+                # Fork is only requested on Linux outside of notebooks, as it is unsafe on macOS and in multi-threaded Jupyter kernels
+                use_fork = sys.platform.startswith("linux") and "ipykernel" not in sys.modules
+                process_context = multiprocessing.get_context("fork" if use_fork else None)
+                maze_per_player = {player.name: self.__maze for player in self.__players}
+
                 # Create a process per player
                 turn_start_synchronizer = multiprocessing.Manager().Barrier(len(self.__players) + 1)
                 turn_timeout_lock = multiprocessing.Manager().Lock()
                 player_processes = {}
                 for player in self.__players:
                     player_processes[player.name] = {"process": None, "input_queue": multiprocessing.Manager().Queue(), "output_queue": multiprocessing.Manager().Queue(), "turn_end_synchronizer": multiprocessing.Manager().Barrier(2)}
-                    player_processes[player.name]["process"] = multiprocessing.Process(target=_player_process_function, args=(player, maze_per_player[player.name], player_processes[player.name]["input_queue"], player_processes[player.name]["output_queue"], turn_start_synchronizer, turn_timeout_lock, player_processes[player.name]["turn_end_synchronizer"], None, None,))
+                    player_processes[player.name]["process"] = process_context.Process(target=_player_process_function, args=(player, maze_per_player[player.name], player_processes[player.name]["input_queue"], player_processes[player.name]["output_queue"], turn_start_synchronizer, turn_timeout_lock, player_processes[player.name]["turn_end_synchronizer"], None, None,))
                     player_processes[player.name]["process"].start()
 
                 # If playing in standard mode, we create processs to wait instead of missing players
@@ -492,9 +506,13 @@ class Game ():
                     waiter_processes = {}
                     for player in self.__players:
                         waiter_processes[player.name] = {"process": None, "input_queue": multiprocessing.Manager().Queue()}
-                        waiter_processes[player.name]["process"] = multiprocessing.Process(target=_waiter_process_function, args=(waiter_processes[player.name]["input_queue"], turn_start_synchronizer,))
+                        waiter_processes[player.name]["process"] = process_context.Process(target=_waiter_process_function, args=(waiter_processes[player.name]["input_queue"], turn_start_synchronizer,))
                         waiter_processes[player.name]["process"].start()
 
+            # In sequential mode, players share the process of the game and need a copy of the maze
+            else:
+                maze_per_player = {player.name: copy.deepcopy(self.__maze) for player in self.__players}
+
             # Add cheese
             game_state = copy.deepcopy(self.__initial_game_state)
             available_cells = [i for i in self.__maze.vertices if i not in self.__initial_game_state.player_locations.values()]
@@ -504,22 +522,31 @@ class Game ():
             self.__rendering_engine.render(self.__players, self.__maze, game_state)
             
             # We play until the game is over
-            players_ready = [player for player in self.__players]
-            players_running = {player.name: True for player in self.__players}
-            all_action_names = [action.value for action in Action]
+            players_ready = list(self.__players_with_names)
+            players_running = {player_name: True for _, player_name in self.__players_with_names}
+            all_action_names = frozenset(action.value for action in Action)
+            action_from_name = {action.value: action for action in Action}
+            game_phases = {}
+            turn_actions = {}
+            durations = {}
             while any(players_running.values()):
 
+                # Reset the turn info of all players
+                for _, player_name in self.__players_with_names:
+                    game_phases[player_name] = "none"
+                    turn_actions[player_name] = "miss"
+                    durations[player_name] = None
+
                 # We communicate the state of the game to the players not in mud
-                game_phases = {player.name: "none" for player in self.__players}
-                turn_actions = {player.name: "miss" for player in self.__players}
-                durations = {player.name: None for player in self.__players}
-                for ready_player in players_ready:
-                    final_stats = copy.deepcopy(stats) if game_state.game_over() else {}
-                    player_game_state = copy.deepcopy(game_state)
+                # In multiprocessing mode, the queue already sends a copy of the game state, so we only copy it in sequential mode
+                is_over = game_state.game_over()
+                for ready_player, ready_player_name in players_ready:
+                    final_stats = copy.deepcopy(stats) if is_over else {}
                     if self.__game_mode in [GameMode.STANDARD, GameMode.SYNCHRONOUS]:
-                        player_processes[ready_player.name]["input_queue"].put((player_game_state, final_stats))
+                        player_processes[ready_player_name]["input_queue"].put((game_state, final_stats))
                     else:
-                        turn_actions[ready_player.name], game_phases[ready_player.name], durations[ready_player.name] = _player_process_function(ready_player, maze_per_player[ready_player.name], None, None, None, None, None, player_game_state, final_stats)
+                        player_game_state = copy.deepcopy(game_state)
+                        turn_actions[ready_player_name], game_phases[ready_player_name], durations[ready_player_name] = _player_process_function(ready_player, maze_per_player[ready_player_name], None, None, None, None, None, player_game_state, final_stats)
                 
                 # In multiprocessing mode, we for everybody to receive data to start
                 # In sequential mode, decisions are already received at this point
@@ -532,65 +559,67 @@ class Game ():
 
                 # In synchronous mode, we wait for everyone
                 if self.__game_mode == GameMode.SYNCHRONOUS:
-                    for player in self.__players:
-                        player_processes[player.name]["turn_end_synchronizer"].wait()
-                        turn_actions[player.name], game_phases[player.name], durations[player.name] = player_processes[player.name]["output_queue"].get()
+                    for _, player_name in self.__players_with_names:
+                        player_processes[player_name]["turn_end_synchronizer"].wait()
+                        turn_actions[player_name], game_phases[player_name], durations[player_name] = player_processes[player_name]["output_queue"].get()
 
                 # In standard mode, we block the possibility to return an action and check who answered in time
                 elif self.__game_mode == GameMode.STANDARD:
 
                     # Wait at least for those in mud
-                    for player in self.__players:
-                        if game_state.is_in_mud(player.name) and players_running[player.name]:
-                            player_processes[player.name]["turn_end_synchronizer"].wait()
-                            turn_actions[player.name], game_phases[player.name], durations[player.name] = player_processes[player.name]["output_queue"].get()
+                    for _, player_name in self.__players_with_names:
+                        if game_state.is_in_mud(player_name) and players_running[player_name]:
+                            player_processes[player_name]["turn_end_synchronizer"].wait()
+                            turn_actions[player_name], game_phases[player_name], durations[player_name] = player_processes[player_name]["output_queue"].get()
 
                     # For others, set timeout and wait for output info of those who passed just before timeout
                     with turn_timeout_lock:
-                        for player in self.__players:
-                            if not game_state.is_in_mud(player.name) and players_running[player.name]:
-                                if not player_processes[player.name]["output_queue"].empty():
-                                    player_processes[player.name]["turn_end_synchronizer"].wait()
-                                    turn_actions[player.name], game_phases[player.name], durations[player.name] = player_processes[player.name]["output_queue"].get()
+                        for _, player_name in self.__players_with_names:
+                            if not game_state.is_in_mud(player_name) and players_running[player_name]:
+                                try:
+                                    turn_actions[player_name], game_phases[player_name], durations[player_name] = player_processes[player_name]["output_queue"].get_nowait()
+                                    player_processes[player_name]["turn_end_synchronizer"].wait()
+                                except queue.Empty:
+                                    pass
 
                 # Check which players are ready to continue
                 players_ready = []
-                for player in self.__players:
-                    if game_phases[player.name] == "postprocessing":
-                        players_running[player.name] = False
-                    if self.__game_mode == GameMode.STANDARD and (game_phases[player.name] == "postprocessing" or turn_actions[player.name] == "miss"):
-                        waiter_processes[player.name]["input_queue"].put(True)
+                for player, player_name in self.__players_with_names:
+                    if game_phases[player_name] == "postprocessing":
+                        players_running[player_name] = False
+                    if self.__game_mode == GameMode.STANDARD and (game_phases[player_name] == "postprocessing" or turn_actions[player_name] == "miss"):
+                        waiter_processes[player_name]["input_queue"].put(True)
                     else:
-                        players_ready.append(player)
+                        players_ready.append((player, player_name))
 
                 # Check for errors
-                if any([turn_actions[player.name] == "error" for player in self.__players]) and not self.__continue_on_error:
+                if any([turn_actions[player_name] == "error" for _, player_name in self.__players_with_names]) and not self.__continue_on_error:
                     raise Exception("A player has crashed, exiting")
 
                 # We save the turn info if we are not postprocessing
                 if not game_state.game_over():
                 
                     # Apply the actions
-                    corrected_actions = {player.name: Action(turn_actions[player.name]) if turn_actions[player.name] in all_action_names else Action.NOTHING for player in self.__players}
+                    corrected_actions = {player_name: action_from_name.get(turn_actions[player_name], Action.NOTHING) for _, player_name in self.__players_with_names}
                     new_game_state = self.__determine_new_game_state(game_state, corrected_actions)
 
                     # Save stats
-                    for player in self.__players:
-                        if game_phases[player.name] == "none":
-                            stats["players"][player.name]["actions"]["miss"] += 1
-                        elif game_phases[player.name] != "preprocessing":
-                            if turn_actions[player.name] in all_action_names and turn_actions[player.name] != Action.NOTHING.value and game_state.player_locations[player.name] == new_game_state.player_locations[player.name] and not new_game_state.is_in_mud(player.name):
-                                stats["players"][player.name]["actions"]["wall"] += 1
+                    for _, player_name in self.__players_with_names:
+                        if game_phases[player_name] == "none":
+                            stats["players"][player_name]["actions"]["miss"] += 1
+                        elif game_phases[player_name] != "preprocessing":
+                            if turn_actions[player_name] in all_action_names and turn_actions[player_name] != Action.NOTHING.value and game_state.player_locations[player_name] == new_game_state.player_locations[player_name] and not new_game_state.is_in_mud(player_name):
+                                stats["players"][player_name]["actions"]["wall"] += 1
                             else:
-                                stats["players"][player.name]["actions"][turn_actions[player.name]] += 1
-                            if turn_actions[player.name] != "mud":
-                                self.__actions_history[player.name].append(corrected_actions[player.name])
-                        if durations[player.name] is not None:
-                            if game_phases[player.name] == "preprocessing":
-                                stats["players"][player.name]["preprocessing_duration"] = durations[player.name]
+                                stats["players"][player_name]["actions"][turn_actions[player_name]] += 1
+                            if turn_actions[player_name] != "mud":
+                                self.__actions_history[player_name].append(corrected_actions[player_name])
+                        if durations[player_name] is not None:
+                            if game_phases[player_name] == "preprocessing":
+                                stats["players"][player_name]["preprocessing_duration"] = durations[player_name]
                             else:
-                                stats["players"][player.name]["turn_durations"].append(durations[player.name])
-                        stats["players"][player.name]["score"] = new_game_state.score_per_player[player.name]
+                                stats["players"][player_name]["turn_durations"].append(durations[player_name])
+                        stats["players"][player_name]["score"] = new_game_state.score_per_player[player_name]
                     stats["turns"] = game_state.turn
                     
                     # Go to next turn
@@ -635,32 +664,29 @@ class Game ():
             if not os.path.exists(self.__save_path):
                 os.makedirs(self.__save_path)
 
-            # Prepare the config dictionary
-            config = {"game_mode": "{GAME_MODE}",
-                      "fixed_maze": self.__maze.as_dict(),
-                      "fixed_cheese": self.__initial_game_state.cheese}
+            # Prepare the code describing the config, with enumeration values written as code
+            config_entries = [("game_mode", "GameMode.SYNCHRONOUS"),
+                              ("fixed_maze", repr(self.__maze.as_dict())),
+                              ("fixed_cheese", repr(self.__initial_game_state.cheese))]
+            config_code = "{" + ",\n          ".join("%s: %s" % (repr(key), value) for key, value in config_entries) + "}"
             
-            # Create a description of the players
-            player_descriptions = []
+            # Prepare the code describing the players
+            player_codes = []
             for player in self.__players:
-                player_descriptions.append({"name": player.name,
-                                            "skin": "{SKIN_" + player.skin.name + "}",
-                                            "team": [team for team in self.__initial_game_state.teams if player.name in self.__initial_game_state.teams[team]][0],
-                                            "location": self.__initial_game_state.player_locations[player.name],
-                                            "actions": "{ACTIONS}"})
+                player_team = [team for team in self.__initial_game_state.teams if player.name in self.__initial_game_state.teams[team]][0]
+                player_actions = "[" + ", ".join("Action." + action.name for action in self.__actions_history[player.name]) + "]"
+                player_codes.append("{'name': %s, 'skin': PlayerSkin.%s, 'team': %s, 'location': %s, 'actions': %s}" % (repr(player.name), player.skin.name, repr(player_team), repr(self.__initial_game_state.player_locations[player.name]), player_actions))
+            players_code = "[" + ",\n                       ".join(player_codes) + "]"
 
             # Create the players' file, forcing players to their initial locations
+            # The notebook is handled as JSON, so that the inserted code is escaped properly
             output_file_name = os.path.join(self.__save_path, datetime.datetime.now().strftime("%Y_%m_%d_%H_%M_%S_%f.ipynb"))
             with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), "save_template.ipynb"), "r") as save_template_file:
-                save_template = save_template_file.read()
-                save_template = save_template.replace("{PLAYERS}", str(player_descriptions).replace("}, ", "},\\n                       "))
-                save_template = save_template.replace("{CONFIG}", str(config).replace(", '", ",\\n          '"))
-                save_template = save_template.replace("'{GAME_MODE}'", "GameMode.SYNCHRONOUS")
-                for skin in PlayerSkin:
-                    save_template = save_template.replace("'{SKIN_" + skin.name + "}'", "PlayerSkin." + skin.name)
-                save_template = save_template.replace("'{ACTIONS}'", "[" + ", ".join("Action." + action.name for action in self.__actions_history[player.name]) + "]")
-                with open(output_file_name, "w") as output_file:
-                    print(save_template, file=output_file)
+                save_template = json.load(save_template_file)
+            for cell in save_template["cells"]:
+                cell["source"] = [line.replace("{CONFIG}", config_code).replace("{PLAYERS}", players_code) for line in cell["source"]]
+            with open(output_file_name, "w") as output_file:
+                json.dump(save_template, output_file, indent=1)
 
         # Apply ending actions of the rendering engine
         self.__rendering_engine.end()
@@ -685,53 +711,56 @@ class Game ():
         # Debug
         assert isinstance(game_state, GameState) # Type check for game_state
         assert isinstance(actions, dict) # Type check for actions
-        assert all(player_name in [player.name for player in self.__players] for player_name in actions) # Type check for actions
+        assert all(player_name in self.__player_names for player_name in actions) # Type check for actions
         assert all(action in Action for action in actions.values()) # All actions are valid
 
         # Initialize new game state
         new_game_state = copy.deepcopy(game_state)
         new_game_state.turn += 1
 
-        # Move all players accordingly
-        for player in self.__players:
-            row, col = self.__maze.i_to_rc(game_state.player_locations[player.name])
+        # Move all players accordingly, and those in mud advance a bit
+        players_per_cell = {}
+        for _, player_name in self.__players_with_names:
+            player_mud = new_game_state.muds[player_name]
+            row, col = self.__maze.i_to_rc(game_state.player_locations[player_name])
             target = None
-            if actions[player.name] == Action.NORTH and row > 0:
+            if actions[player_name] == Action.NORTH and row > 0:
                 target = self.__maze.rc_to_i(row - 1, col)
-            elif actions[player.name] == Action.SOUTH and row < self.__maze.height - 1:
+            elif actions[player_name] == Action.SOUTH and row < self.__maze.height - 1:
                 target = self.__maze.rc_to_i(row + 1, col)
-            elif actions[player.name] == Action.WEST and col > 0:
+            elif actions[player_name] == Action.WEST and col > 0:
                 target = self.__maze.rc_to_i(row, col - 1)
-            elif actions[player.name] == Action.EAST and col < self.__maze.width - 1:
+            elif actions[player_name] == Action.EAST and col < self.__maze.width - 1:
                 target = self.__maze.rc_to_i(row, col + 1)
-            if target is not None and self.__maze.i_exists(target) and self.__maze.has_edge(game_state.player_locations[player.name], target):
-                weight = self.__maze.get_weight(game_state.player_locations[player.name], target)
+            if target is not None and self.__maze.i_exists(target) and self.__maze.has_edge(game_state.player_locations[player_name], target):
+                weight = self.__maze.get_weight(game_state.player_locations[player_name], target)
                 if weight == 1:
-                    new_game_state.player_locations[player.name] = target
+                    new_game_state.player_locations[player_name] = target
                 elif weight > 1:
-                    new_game_state.muds[player.name]["target"] = target
-                    new_game_state.muds[player.name]["count"] = weight
-
-        # All players in mud advance a bit
-        for player in self.__players:
-            if new_game_state.is_in_mud(player.name):
-                new_game_state.muds[player.name]["count"] -= 1
-                if new_game_state.muds[player.name]["count"] == 0:
-                    new_game_state.player_locations[player.name] = new_game_state.muds[player.name]["target"]
-                    new_game_state.muds[player.name]["target"] = None
+                    player_mud["target"] = target
+                    player_mud["count"] = weight
+            if player_mud["target"] is not None:
+                player_mud["count"] -= 1
+                if player_mud["count"] == 0:
+                    new_game_state.player_locations[player_name] = player_mud["target"]
+                    player_mud["target"] = None
+            players_per_cell.setdefault(new_game_state.player_locations[player_name], []).append(player_name)
 
         # Update cheese and scores
+        remaining_cheese = []
         for c in game_state.cheese:
-            players_on_cheese = [player for player in self.__players if c == new_game_state.player_locations[player.name]]
-            for player_on_cheese in players_on_cheese:
-                new_game_state.score_per_player[player_on_cheese.name] += 1.0 / len(players_on_cheese)
-            if len(players_on_cheese) > 0:
-                new_game_state.cheese.remove(c)
+            players_on_cheese = players_per_cell.get(c)
+            if players_on_cheese:
+                share = 1.0 / len(players_on_cheese)
+                for player_on_cheese in players_on_cheese:
+                    new_game_state.score_per_player[player_on_cheese] += share
+            else:
+                remaining_cheese.append(c)
+        new_game_state.cheese[:] = remaining_cheese
         
         # Store trace for GUI
-        for player in self.__players:
-            self.__player_traces[player.name].append(new_game_state.player_locations[player.name])
-            self.__player_traces[player.name] = self.__player_traces[player.name][-self.__trace_length:]
+        for _, player_name in self.__players_with_names:
+            self.__player_traces[player_name].append(new_game_state.player_locations[player_name])
         
         # Return new game state
         return new_game_state
@@ -767,10 +796,10 @@ class Game ():
             assert len(set(self.__fixed_cheese)) == len(self.__fixed_cheese) # Only distinct cheese
             assert len(available_cells) >= len(self.__fixed_cheese) # Enough space for cheese
             assert all([self.__maze.i_exists(cell) for cell in self.__fixed_cheese]) # Only on existing cells
-            assert all([cell in available_cells for cell in self.__fixed_cheese]) # Only on available cells
+            assert set(self.__fixed_cheese).issubset(available_cells) # Only on available cells
 
             # Place the cheese
-            cheese = copy.deepcopy(self.__fixed_cheese)
+            cheese = list(self.__fixed_cheese)
 
         # Otherwise, we place the cheese randomly
         else:
@@ -781,9 +810,9 @@ class Game ():
             assert len(available_cells) >= self.__nb_cheese # Enough space for cheese
 
             # Place the cheese randomly
+            # Only the needed cells are drawn, instead of shuffling all available cells
             rng = random.Random(self.__game_random_seed_cheese)
-            rng.shuffle(available_cells)
-            cheese = available_cells[:self.__nb_cheese]
+            cheese = rng.sample(available_cells, self.__nb_cheese)
 
         # Return the cheese
         return cheese
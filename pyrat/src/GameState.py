@@ -33,6 +33,9 @@ class GameState ():
         It also provides a few useful functions to determine who is currently leading, etc.
     """
 
+    # Attributes are fixed, which makes accessing them faster and instances smaller
+    __slots__ = ("__player_locations", "__score_per_player", "__muds", "__teams", "__cheese", "__turn")
+
     #############################################################################################################################################
     #                                                               MAGIC METHODS                                                               #
     #############################################################################################################################################
@@ -245,10 +248,10 @@ class GameState ():
 
         # Debug
         assert isinstance(name, str) # Type check for the name
-        assert name in self.muds # Check that the player exists
+        assert name in self.__muds # Check that the player exists
 
         # Get whether the player is currently crossing mud
-        in_mud = self.muds[name]["target"] is not None
+        in_mud = self.__muds[name]["target"] is not None
         return in_mud
     
     #############################################################################################################################################
@@ -265,7 +268,7 @@ class GameState ():
         """
         
         # Aggregate players of the team
-        score_per_team = {team: round(sum([self.score_per_player[player] for player in self.teams[team]]), 5) for team in self.teams}
+        score_per_team = {team: round(sum(self.__score_per_player[player] for player in team_players), 5) for team, team_players in self.__teams.items()}
         return score_per_team
 
     #############################################################################################################################################
@@ -282,25 +285,48 @@ class GameState ():
                 * is_over: Boolean indicating if the game is over.
         """
 
+        # Count the remaining cheese
+        nb_cheese = len(self.__cheese)
+
         # The game is over when there is no more cheese
-        if len(self.cheese) == 0:
+        if nb_cheese == 0:
             is_over = True
-            return is_over
 
         # In a multi-team game, the game is over when no team can change their ranking anymore
-        score_per_team = self.get_score_per_team()
-        if len(score_per_team) > 1:
-            is_over = True
-            for team_1 in score_per_team:
-                for team_2 in score_per_team:
-                    if team_1 != team_2:
-                        if score_per_team[team_1] == score_per_team[team_2] or (score_per_team[team_1] < score_per_team[team_2] and score_per_team[team_1] + len(self.cheese) >= score_per_team[team_2]):
-                            is_over = False
-            return is_over
-
-        # The game is not over
-        is_over = False
+        # Once scores are sorted, it is enough to check if a team can reach the score of the next one
+        elif len(self.__teams) > 1:
+            score_per_team = self.get_score_per_team()
+            sorted_scores = sorted(score_per_team.values())
+            is_over = all(sorted_scores[i] + nb_cheese < sorted_scores[i + 1] for i in range(len(sorted_scores) - 1))
+
+        # Otherwise, the game is not over
+        else:
+            is_over = False
+
         return is_over
 
+    #############################################################################################################################################
+
+    def freeze ( self: Self
+               ) ->    Tuple[Integral, Tuple[Tuple[str, Integral], ...], Tuple[Tuple[str, Number], ...], Tuple[Tuple[str, Optional[Integral], Integral], ...], FrozenSet[Integral]]:
+        
+        """
+            This function returns an immutable snapshot of the game state.
+            Contrary to the game state itself, it can be compared and hashed cheaply, for instance to remember states already explored in a search.
+            Teams are not included, as they do not change during a game.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * snapshot: Tuple containing the turn, locations, scores, muds (name, target, count), and set of cells with cheese.
+        """
+
+        # Gather the attributes in tuples
+        player_locations = tuple(self.__player_locations.items())
+        score_per_player = tuple(self.__score_per_player.items())
+        muds = tuple((name, self.__muds[name]["target"], self.__muds[name]["count"]) for name in self.__muds)
+        cheese = frozenset(self.__cheese)
+        snapshot = (self.__turn, player_locations, score_per_player, muds, cheese)
+        return snapshot
+
 #####################################################################################################################################################
 #####################################################################################################################################################
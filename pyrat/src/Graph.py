@@ -19,6 +19,7 @@ from typing_extensions import *
 from numbers import *
 import random
 import sys
+import collections
 
 # Numpy is an optional dependency
 try:
@@ -49,6 +50,9 @@ class Graph ():
         It should be manipulated using the methods defined below and not directly.
     """
 
+    # Attributes are fixed, which makes accessing them faster and instances smaller
+    __slots__ = ("__adjacency",)
+
     #############################################################################################################################################
     #                                                               MAGIC METHODS                                                               #
     #############################################################################################################################################
@@ -83,15 +87,16 @@ class Graph ():
                 * string: String representation of the object.
         """
         
-        # Create the string
-        string = "Graph object:\n"
-        string += "|  Vertices: {}\n".format(self.vertices)
-        string += "|  Adjacency matrix:\n"
+        # Create the string, joining all lines at once
+        lines = ["Graph object:"]
+        lines.append("|  Vertices: {}".format(self.vertices))
+        lines.append("|  Adjacency matrix:")
         for vertex_1, vertex_2 in self.edges:
-            weight = self.get_weight(vertex_1, vertex_2)
-            symmetric = self.edge_is_symmetric(vertex_1, vertex_2)
-            string += "|  |  {} {} ({}) --> {}\n".format(vertex_1, "<--" if symmetric else "---", weight, vertex_2)
-        return string.strip()
+            weight = self.__adjacency[vertex_1][vertex_2]
+            symmetric = vertex_1 in self.__adjacency[vertex_2]
+            lines.append("|  |  {} {} ({}) --> {}".format(vertex_1, "<--" if symmetric else "---", weight, vertex_2))
+        string = "\n".join(lines).strip()
+        return string
 
     #############################################################################################################################################
     #                                                            ATTRIBUTE ACCESSORS                                                            #
@@ -147,11 +152,14 @@ class Graph ():
         """
         
         # Get the list of edges
+        # A set of the edges already listed avoids searching the list for symmetric edges
         edge_list = []
-        for vertex_1 in self.vertices:
-            for vertex_2 in self.get_neighbors(vertex_1):
-                if (vertex_2, vertex_1) not in edge_list:
+        listed_edges = set()
+        for vertex_1, neighbors in self.__adjacency.items():
+            for vertex_2 in neighbors:
+                if (vertex_2, vertex_1) not in listed_edges:
                     edge_list.append((vertex_1, vertex_2))
+                    listed_edges.add((vertex_1, vertex_2))
         return edge_list
     
     #############################################################################################################################################
@@ -255,7 +263,7 @@ class Graph ():
         assert vertex in self.__adjacency # Vertex is in the graph
 
         # Get neighbors
-        neighbors = list(self.__adjacency[vertex].keys())
+        neighbors = list(self.__adjacency[vertex])
         return neighbors
 
     #############################################################################################################################################
@@ -320,12 +328,10 @@ class Graph ():
         # Debug
         assert "numpy" in globals() # Numpy is available
 
-        # Create the adjacency matrix
+        # Create the adjacency matrix, filling all edges at once
+        rows, cols, weights = self.__edges_as_index_lists()
         adjacency_matrix = numpy.zeros((self.nb_vertices, self.nb_vertices), dtype=int)
-        for i, vertex_1 in enumerate(self.__adjacency):
-            for j, vertex_2 in enumerate(self.__adjacency):
-                if self.has_edge(vertex_1, vertex_2):
-                    adjacency_matrix[i, j] = self.get_weight(vertex_1, vertex_2)
+        adjacency_matrix[rows, cols] = weights
         return adjacency_matrix
 
     #############################################################################################################################################
@@ -345,12 +351,32 @@ class Graph ():
         # Debug
         assert "torch" in globals() # Torch is available
 
-        # Create the adjacency matrix
+        # Create the adjacency matrix, filling all edges at once
+        rows, cols, weights = self.__edges_as_index_lists()
         adjacency_matrix = torch.zeros((self.nb_vertices, self.nb_vertices), dtype=int)
-        for i, vertex_1 in enumerate(self.__adjacency):
-            for j, vertex_2 in enumerate(self.__adjacency):
-                if self.has_edge(vertex_1, vertex_2):
-                    adjacency_matrix[i, j] = self.get_weight(vertex_1, vertex_2)
+        adjacency_matrix[torch.tensor(rows, dtype=torch.long), torch.tensor(cols, dtype=torch.long)] = torch.tensor(weights, dtype=adjacency_matrix.dtype)
+        return adjacency_matrix
+
+    #############################################################################################################################################
+
+    def as_scipy_csr_matrix ( self: Self,
+                            ) ->    "scipy.sparse.csr_matrix":
+
+        """
+            Returns a sparse scipy matrix representing the graph, in compressed sparse row format.
+            Entries are given in order of the vertices.
+            Contrary to dense matrices, memory grows with the number of edges, and the result can be given directly to scipy.sparse.csgraph algorithms.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * adjacency_matrix: Sparse matrix representing the adjacency matrix.
+        """
+
+        # Create the adjacency matrix from the list of edges
+        # Scipy is only imported here, as importing it is slow and most programs do not need this export
+        import scipy.sparse
+        rows, cols, weights = self.__edges_as_index_lists()
+        adjacency_matrix = scipy.sparse.csr_matrix((weights, (rows, cols)), shape=(self.nb_vertices, self.nb_vertices), dtype=int)
         return adjacency_matrix
 
     #############################################################################################################################################
@@ -374,9 +400,10 @@ class Graph ():
         assert vertex in self.__adjacency # Vertex is in the graph
 
         # Remove the vertex and connections to it
-        for neighbor in self.__adjacency[vertex]:
-            del self.__adjacency[neighbor][vertex]
+        # Edges are not necessarily symmetric, so all vertices may have an edge to the removed one
         del self.__adjacency[vertex]
+        for neighbors in self.__adjacency.values():
+            neighbors.pop(vertex, None)
         
     #############################################################################################################################################
 
@@ -428,22 +455,22 @@ class Graph ():
         # Debug
         assert self.nb_vertices > 0 # The graph has at least one vertex
 
-        # Create a list of visited vertices
-        vertices = list(self.vertices)
-        visited = {vertex: False for vertex in self.__adjacency}
-        visited[vertices[0]] = True
-        stack = [vertices[0]]
+        # Create a set of visited vertices, starting from the first vertex
+        nb_vertices = len(self.__adjacency)
+        first_vertex = next(iter(self.__adjacency))
+        visited = {first_vertex}
+        stack = [first_vertex]
                 
-        # Depth-first search
-        while stack:
+        # Depth-first search, stopped as soon as all vertices have been visited
+        while stack and len(visited) < nb_vertices:
             vertex = stack.pop()
-            for neighbor in self.get_neighbors(vertex):
-                if not visited[neighbor]:
-                    visited[neighbor] = True
+            for neighbor in self.__adjacency[vertex]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
                     stack.append(neighbor)
         
         # Check if all vertices have been visited
-        connected = all(visited.values())
+        connected = len(visited) == nb_vertices
         return connected
 
     #############################################################################################################################################
@@ -469,26 +496,30 @@ class Graph ():
         rng = random.Random(random_seed)
 
         # Shuffle vertices
-        vertices_to_add = self.vertices
-        rng.shuffle(vertices_to_add)
+        # They are then stored in a queue, as vertices that cannot be added yet are moved to the end
+        vertices = self.vertices
+        rng.shuffle(vertices)
+        vertices_to_add = collections.deque(vertices)
 
         # Create the minimum spanning tree, initialized with a random vertex
         mst = Graph()
-        vertex = vertices_to_add.pop(0)
+        vertex = vertices_to_add.popleft()
         mst.add_vertex(vertex)
+        vertices_in_mst = {vertex}
         
         # Add vertices until all are included
         while vertices_to_add:
-            vertex = vertices_to_add.pop(0)
+            vertex = vertices_to_add.popleft()
             neighbors = self.get_neighbors(vertex)
             rng.shuffle(neighbors)
-            neighbors_in_mst = [neighbor for neighbor in neighbors if neighbor in mst.vertices]
+            neighbors_in_mst = [neighbor for neighbor in neighbors if neighbor in vertices_in_mst]
             if neighbors_in_mst:
                 neighbor = neighbors_in_mst[0]
                 symmetric = self.edge_is_symmetric(vertex, neighbor)
                 weight = self.get_weight(neighbor, vertex)
                 mst.add_vertex(vertex)
                 mst.add_edge(vertex, neighbor, weight, symmetric)
+                vertices_in_mst.add(vertex)
             else:
                 vertices_to_add.append(vertex)
 
@@ -497,6 +528,28 @@ class Graph ():
 
     #############################################################################################################################################
 
+    def has_vertex ( self:   Self,
+                     vertex: Hashable
+                   ) ->      bool:
+        
+        """
+            Checks whether a vertex exists in the graph.
+            In:
+                * self:   Reference to the current object.
+                * vertex: Vertex to check.
+            Out:
+                * vertex_exists: Whether the vertex is in the graph.
+        """
+
+        # Debug
+        assert isinstance(vertex, Hashable) # Type check for vertex
+
+        # Check whether the vertex exists, using the adjacency dictionary directly to avoid a list copy and scan
+        vertex_exists = vertex in self.__adjacency
+        return vertex_exists
+
+    #############################################################################################################################################
+
     def has_edge ( self:      Self,
                    vertex_1:  Hashable,
                    vertex_2:  Hashable,
@@ -518,8 +571,8 @@ class Graph ():
         assert vertex_1 in self.__adjacency # Vertex 1 is in the graph
         assert vertex_2 in self.__adjacency # Vertex 2 is in the graph
 
-        # Check whether the edge exists
-        edge_exists = vertex_2 in self.get_neighbors(vertex_1)
+        # Check whether the edge exists, using the neighbors dictionary directly to avoid a list copy and scan
+        edge_exists = vertex_2 in self.__adjacency[vertex_1]
         return edge_exists
 
     #############################################################################################################################################
@@ -550,5 +603,35 @@ class Graph ():
         symmetric = self.has_edge(vertex_2, vertex_1)
         return symmetric
 
+    #############################################################################################################################################
+    #                                                              PRIVATE METHODS                                                              #
+    #############################################################################################################################################
+
+    def __edges_as_index_lists ( self: Self,
+                               ) ->    Tuple[List[Integral], List[Integral], List[Number]]:
+
+        """
+            Returns the edges of the graph as three lists of the same length, to fill adjacency matrices at once.
+            Vertices are identified by their position in the order of the vertices.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * rows:    Index of the first vertex of each edge.
+                * cols:    Index of the second vertex of each edge.
+                * weights: Weight of each edge.
+        """
+
+        # Associate each vertex with its index
+        vertex_indices = {vertex: i for i, vertex in enumerate(self.__adjacency)}
+
+        # Go through all edges
+        rows, cols, weights = [], [], []
+        for vertex_1, neighbors in self.__adjacency.items():
+            for vertex_2, weight in neighbors.items():
+                rows.append(vertex_indices[vertex_1])
+                cols.append(vertex_indices[vertex_2])
+                weights.append(weight)
+        return rows, cols, weights
+
 #####################################################################################################################################################
 #####################################################################################################################################################
@@ -91,7 +91,7 @@ class HolesOnSideRandomMaze (RandomMaze):
             vertex = vertices_to_add.pop(self._rng.randint(0, len(vertices_to_add) - 1))
 
             # Add it if it is not already in the maze
-            if vertex in self.vertices:
+            if self.has_vertex(vertex):
                 continue
             self.add_vertex(vertex)
 
@@ -107,10 +107,15 @@ class HolesOnSideRandomMaze (RandomMaze):
                 vertices_to_add.append(self.rc_to_i(row, col + 1))
         
         # Connect the vertices
-        for i, vertex_1 in enumerate(self.vertices):
-            for j, vertex_2 in enumerate(self.vertices, i + 1):
-                if self.coords_difference(vertex_1, vertex_2) in [(0, 1), (1, 0), (-1, 0), (0, -1)]:
-                    self.add_edge(vertex_1, vertex_2)
+        # Neighbors are connected in order of addition to the maze, as this order determines the walls drawn later
+        vertices = self.vertices
+        vertex_positions = {vertex: i for i, vertex in enumerate(vertices)}
+        for vertex_1 in vertices:
+            row, col = self.i_to_rc(vertex_1)
+            neighbors = [self.rc_to_i(row + delta_row, col + delta_col) for delta_row, delta_col in [(0, 1), (1, 0), (-1, 0), (0, -1)] if 0 <= row + delta_row < self.height and 0 <= col + delta_col < self.width]
+            neighbors = sorted([neighbor for neighbor in neighbors if neighbor in vertex_positions], key=vertex_positions.get)
+            for vertex_2 in neighbors:
+                self.add_edge(vertex_1, vertex_2)
 
 #####################################################################################################################################################
 #####################################################################################################################################################
\ No newline at end of file
@@ -55,6 +55,21 @@ class Maze (Graph, abc.ABC):
         In this implementation, cells are placed on a grid and can only be connected along the cardinal directions.
     """
 
+    #############################################################################################################################################
+    #                                                              CLASS ATTRIBUTES                                                             #
+    #############################################################################################################################################
+
+    """
+        Moving between adjacent cells corresponds to an action, determined by the difference of coordinates (row, col) between the cells.
+        A dictionary allows to find it with a single lookup.
+    """
+
+    COORDS_DIFFERENCE_TO_ACTION = {(0, 0): Action.NOTHING,
+                                   (0, -1): Action.WEST,
+                                   (0, 1): Action.EAST,
+                                   (1, 0): Action.SOUTH,
+                                   (-1, 0): Action.NORTH}
+
     #############################################################################################################################################
     #                                                               MAGIC METHODS                                                               #
     #############################################################################################################################################
@@ -110,17 +125,18 @@ class Maze (Graph, abc.ABC):
                 * string: String representation of the object.
         """
         
-        # Create the string
-        string = "Maze object:\n"
-        string += "|  Width: {}\n".format(self.width)
-        string += "|  Height: {}\n".format(self.height)
-        string += "|  Vertices: {}\n".format(self.vertices)
-        string += "|  Adjacency matrix:\n"
+        # Create the string, joining all lines at once
+        lines = ["Maze object:"]
+        lines.append("|  Width: {}".format(self.width))
+        lines.append("|  Height: {}".format(self.height))
+        lines.append("|  Vertices: {}".format(self.vertices))
+        lines.append("|  Adjacency matrix:")
         for vertex_1, vertex_2 in self.edges:
             weight = self.get_weight(vertex_1, vertex_2)
             symmetric = self.edge_is_symmetric(vertex_1, vertex_2)
-            string += "|  |  {} {} ({}) --> {}\n".format(vertex_1, "<--" if symmetric else "---", weight, vertex_2)
-        return string.strip()
+            lines.append("|  |  {} {} ({}) --> {}".format(vertex_1, "<--" if symmetric else "---", weight, vertex_2))
+        string = "\n".join(lines).strip()
+        return string
 
     #############################################################################################################################################
     #                                                                  GETTERS                                                                  #
@@ -187,8 +203,7 @@ class Maze (Graph, abc.ABC):
         assert isinstance(index, Integral) # Type check for index
 
         # Conversion
-        row = index // self.width
-        col = index % self.width
+        row, col = divmod(index, self._width)
         return row, col
     
     #############################################################################################################################################
@@ -214,7 +229,7 @@ class Maze (Graph, abc.ABC):
         assert isinstance(col, Integral) # Type check for col
 
         # Conversion
-        index = row * self.width + col
+        index = row * self._width + col
         return index
     
     #############################################################################################################################################
@@ -239,7 +254,7 @@ class Maze (Graph, abc.ABC):
         assert isinstance(col, Integral) # Type check for col
 
         # Check if the cell exists
-        exists = 0 <= row < self.height and 0 <= col < self.width and self.rc_to_i(row, col) in self.vertices
+        exists = 0 <= row < self._height and 0 <= col < self._width and self.has_vertex(self.rc_to_i(row, col))
         return exists
     
     #############################################################################################################################################
@@ -261,7 +276,7 @@ class Maze (Graph, abc.ABC):
         assert isinstance(index, Integral) # Type check for index
 
         # Check if the cell exists
-        exists = index in self.vertices
+        exists = self.has_vertex(index)
         return exists
     
     #############################################################################################################################################
@@ -350,7 +365,7 @@ class Maze (Graph, abc.ABC):
         assert isinstance(weight, Integral) # Type check for weight
         assert self.i_exists(vertex_1) # Vertex 1 is in the maze
         assert self.i_exists(vertex_2) # Vertex 2 is in the maze
-        assert self.coords_difference(vertex_1, vertex_2) in [(0, 1), (0, -1), (1, 0), (-1, 0)] # Vertices are adjacent on the grid
+        assert abs(vertex_1 - vertex_2) == self._width or (abs(vertex_1 - vertex_2) == 1 and vertex_1 // self._width == vertex_2 // self._width) # Vertices are adjacent on the grid
 
         # If the symmetric edge already exists, we do not add it
         if self.has_edge(vertex_2, vertex_1):
@@ -377,11 +392,10 @@ class Maze (Graph, abc.ABC):
         # Debug
         assert "numpy" in globals() # Numpy is available
 
-        # Create the adjacency matrix
+        # Create the adjacency matrix, filling all edges at once
+        rows, cols, weights = self.__edges_as_cell_lists()
         adjacency_matrix = numpy.zeros((self.width * self.height, self.width * self.height), dtype=int)
-        for vertex in self.vertices:
-            for neighbor in self.get_neighbors(vertex):
-                adjacency_matrix[vertex, neighbor] = self.get_weight(vertex, neighbor)
+        adjacency_matrix[rows, cols] = weights
         return adjacency_matrix
 
     #############################################################################################################################################
@@ -402,11 +416,32 @@ class Maze (Graph, abc.ABC):
         # Debug
         assert "torch" in globals() # Torch is available
 
-        # Create the adjacency matrix
+        # Create the adjacency matrix, filling all edges at once
+        rows, cols, weights = self.__edges_as_cell_lists()
         adjacency_matrix = torch.zeros((self.width * self.height, self.width * self.height), dtype=torch.int)
-        for vertex in self.vertices:
-            for neighbor in self.get_neighbors(vertex):
-                adjacency_matrix[vertex, neighbor] = self.get_weight(vertex, neighbor)
+        adjacency_matrix[torch.tensor(rows, dtype=torch.long), torch.tensor(cols, dtype=torch.long)] = torch.tensor(weights, dtype=adjacency_matrix.dtype)
+        return adjacency_matrix
+
+    #############################################################################################################################################
+
+    def as_scipy_csr_matrix ( self: Self,
+                            ) ->    "scipy.sparse.csr_matrix":
+
+        """
+            This redefines a method of the parent class.
+            Returns a sparse scipy matrix representing the maze, in compressed sparse row format.
+            Here, we have an entry for each cell in the maze.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * adjacency_matrix: Sparse matrix representing the adjacency matrix.
+        """
+
+        # Create the adjacency matrix from the list of edges
+        # Scipy is imported lazily, as in the parent class
+        import scipy.sparse
+        rows, cols, weights = self.__edges_as_cell_lists()
+        adjacency_matrix = scipy.sparse.csr_matrix((weights, (rows, cols)), shape=(self.width * self.height, self.width * self.height), dtype=int)
         return adjacency_matrix
 
     #############################################################################################################################################
@@ -435,19 +470,8 @@ class Maze (Graph, abc.ABC):
         # Get the coordinates difference
         difference = self.coords_difference(source, target)
 
-        # Translate in a move
-        if difference == (0, 0):
-            action = Action.NOTHING
-        elif difference == (0, -1):
-            action = Action.WEST
-        elif difference == (0, 1):
-            action = Action.EAST
-        elif difference == (1, 0):
-            action = Action.SOUTH
-        elif difference == (-1, 0):
-            action = Action.NORTH
-        else:
-            action = None
+        # Translate in a move, or None if cells are not adjacent
+        action = self.COORDS_DIFFERENCE_TO_ACTION.get(difference)
         return action
 
     #############################################################################################################################################
@@ -497,5 +521,35 @@ class Maze (Graph, abc.ABC):
         # By default we raise an error
         raise NotImplementedError("This method must be implemented in the child classes.")
 
+    #############################################################################################################################################
+    #                                                              PRIVATE METHODS                                                              #
+    #############################################################################################################################################
+
+    def __edges_as_cell_lists ( self: Self,
+                              ) ->    Tuple[List[Integral], List[Integral], List[Number]]:
+
+        """
+            Returns the edges of the maze as three lists of the same length, to fill adjacency matrices at once.
+            Contrary to the parent class, vertices are identified by their cell index.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * rows:    Cell of the first vertex of each edge.
+                * cols:    Cell of the second vertex of each edge.
+                * weights: Weight of each edge.
+        """
+
+        # Go through all edges
+        # Methods are bound once outside of the loop
+        rows, cols, weights = [], [], []
+        get_neighbors = self.get_neighbors
+        get_weight = self.get_weight
+        for vertex in self.vertices:
+            for neighbor in get_neighbors(vertex):
+                rows.append(vertex)
+                cols.append(neighbor)
+                weights.append(get_weight(vertex, neighbor))
+        return rows, cols, weights
+
 #####################################################################################################################################################
 #####################################################################################################################################################
@@ -17,7 +17,6 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import math
 
 # PyRat imports
 from pyrat.src.Maze import Maze
@@ -104,15 +103,15 @@ class MazeFromDict (Maze):
         vertices = self.__description.keys()
 
         # Determine the edges
-        edges = []
-        for vertex in self.__description:
-            neighbors = self.__description[vertex]
-            for neighbor in neighbors:
-                edges.append((vertex, neighbor, self.__description[vertex][neighbor]))
+        edges = [(vertex, neighbor, weight) for vertex, neighbors in self.__description.items() for neighbor, weight in neighbors.items()]
 
         # Determine the dimensions of the maze
-        self._width = max([abs(edge[1] - edge[0]) for edge in edges])
-        self._height = math.ceil((max(vertices) + 1) / self.width)
+        # Dimensions given at initialization are kept, as the inferred width is wrong if the maze has no vertical edge
+        if self._width is None:
+            self._width = max(abs(edge[1] - edge[0]) for edge in edges)
+        # Height is computed with an integer ceiling division, to avoid going through floats
+        if self._height is None:
+            self._height = -(-(max(vertices) + 1) // self._width)
 
         # Add vertices and edges
         for vertex in vertices:
@@ -17,7 +17,6 @@
 from typing import *
 from typing_extensions import *
 from numbers import *
-import math
 
 # PyRat imports
 from pyrat.src.Maze import Maze
@@ -101,22 +100,28 @@ class MazeFromMatrix (Maze):
         """
 
         # Determine the vertices
+        # The matrix is converted to nested lists once, to avoid indexing the numpy or torch object element by element
+        matrix = self.__description.tolist()
         vertices = []
-        for vertex in range(self.__description.shape[0]):
-            neighbors = [neighbor for neighbor in range(self.__description.shape[1]) if self.__description[vertex, neighbor] > 0]
+        for vertex in range(len(matrix)):
+            neighbors = [neighbor for neighbor in range(len(matrix[vertex])) if matrix[vertex][neighbor] > 0]
             if len(neighbors) > 0:
                 vertices.append(vertex)
 
         # Determine the edges
         edges = []
-        for vertex in range(self.__description.shape[0]):
-            for neighbor in range(self.__description.shape[1]):
-                if self.__description[vertex, neighbor] > 0:
-                    edges.append((vertex, neighbor, self.__description[vertex, neighbor].item()))
+        for vertex in range(len(matrix)):
+            for neighbor in range(len(matrix[vertex])):
+                if matrix[vertex][neighbor] > 0:
+                    edges.append((vertex, neighbor, matrix[vertex][neighbor]))
 
         # Determine the dimensions of the maze
-        self._width = max([abs(edge[1] - edge[0]) for edge in edges])
-        self._height = math.ceil((max(vertices) + 1) / self.width)
+        # Dimensions given at initialization are kept, as the inferred width is wrong if the maze has no vertical edge
+        if self._width is None:
+            self._width = max(abs(edge[1] - edge[0]) for edge in edges)
+        # Height is computed with an integer ceiling division, to avoid going through floats
+        if self._height is None:
+            self._height = -(-(max(vertices) + 1) // self._width)
 
         # Add vertices and edges
         for vertex in vertices:
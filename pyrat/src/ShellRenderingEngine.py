@@ -142,6 +142,9 @@ class ShellRenderingEngine (RenderingEngine):
             scores_str += " + ".join(["%s (%s)" % (player_in_team, str(round(game_state.score_per_player[player_in_team], 3)).rstrip('0').rstrip('.') if game_state.score_per_player[player_in_team] > 0 else "0") for player_in_team in game_state.teams[team]])
         environment_str += scores_str
 
+        # Cells with cheese, for fast lookup
+        cheese_cells = set(game_state.cheese)
+
         # Consider cells in lexicographic order
         environment_str += "\n" + wall * (maze.width * (cell_width + 1) + 1)
         for row in range(maze.height):
@@ -154,7 +157,7 @@ class ShellRenderingEngine (RenderingEngine):
                     
                     # Check cell contents
                     players_in_cell = [player.name for player in players if game_state.player_locations[player.name] == maze.rc_to_i(row, col)]
-                    cheese_in_cell = maze.rc_to_i(row, col) in game_state.cheese
+                    cheese_in_cell = maze.rc_to_i(row, col) in cheese_cells
 
                     # Find subrow contents (nothing, cell number, cheese, trace, player)
                     background = wall if not maze.rc_exists(row, col) else ground
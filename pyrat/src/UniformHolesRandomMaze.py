@@ -95,7 +95,7 @@ class UniformHolesRandomMaze (RandomMaze):
                     self.add_edge(self.rc_to_i(row, col), self.rc_to_i(row, col - 1))
 
         # Remove some vertices until the desired density is reached
-        while self.nb_vertices() > self._target_nb_vertices:
+        while self.nb_vertices > self._target_nb_vertices:
 
             # Remove a random vertex
             vertex = self._rng.choice(self.vertices)
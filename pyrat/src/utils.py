@@ -23,6 +23,7 @@ import inspect
 import pdoc
 import pathlib
 import sys
+import functools
 
 #####################################################################################################################################################
 ##################################################################### FUNCTIONS #####################################################################
@@ -98,19 +99,22 @@ def caller_file () -> str:
 
 #####################################################################################################################################################
 
-def pyrat_files () -> List[str]:
+@functools.lru_cache(maxsize=None)
+def pyrat_files () -> FrozenSet[str]:
 
     """
-        Returns the list of all the files in the PyRat library.
+        Returns the set of all the files in the PyRat library.
+        The set is computed once, as it is checked each time the engine accesses a game state.
+        It is immutable, so that callers cannot alter the cached result.
         In:
             * None.
         Out:
-            * files: The list of all the files in the PyRat library.
+            * files: The set of all the files in the PyRat library.
     """
 
-    # Get the list of all the files in the PyRat library
+    # Get the set of all the files in the PyRat library
     pyrat_path = os.path.dirname(os.path.realpath(__file__))
-    files = [os.path.join(pyrat_path, file) for file in os.listdir(pyrat_path) if file.endswith(".py")]
+    files = frozenset(os.path.join(pyrat_path, file) for file in os.listdir(pyrat_path) if file.endswith(".py"))
     return files
 
 #####################################################################################################################################################